@@ -1,11 +1,12 @@
 import tempfile
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 import streamlit as st
 
-from transform import transform_files
+from transform import build_inventory_from_a, transform_files
 
 
 # --- Config ---
@@ -13,6 +14,18 @@ TEMPLATE_PATH = Path("templates") / "Renee(B).xlsx"
 NY_TZ = ZoneInfo("America/New_York")
 
 
+@st.cache_resource
+def load_template_bytes(path: str, mtime: float) -> bytes:
+    # mtime is part of the cache key so an updated template is picked up
+    return Path(path).read_bytes()
+
+
+@st.cache_data(max_entries=8)
+def cached_inventory(a_bytes: bytes, defect_exclusion: bool) -> dict:
+    # Keyed on the uploaded content, so toggling other options skips re-parsing A
+    return build_inventory_from_a(BytesIO(a_bytes), defect_exclusion=defect_exclusion)
+
+
 st.set_page_config(page_title="Supplier Data Transformer", layout="wide")
 
 st.title("Supplier Data Transformer")
@@ -63,16 +76,18 @@ if run:
         with tempfile.TemporaryDirectory() as tmpdir:
             tmpdir = Path(tmpdir)
 
-            # Save A
-            path_a = tmpdir / "input_A.xlsx"
-            path_a.write_bytes(file_a.getbuffer())
+            # Inventory from A, parsed straight from the upload (cached across reruns).
+            # Drop our copy of the bytes right away so it isn't held while B is processed.
+            a_bytes = file_a.getvalue()
+            inv = cached_inventory(a_bytes, defect_exclusion)
+            del a_bytes
 
-            # Choose template B: override upload or repo template
+            # Choose template B: override upload or repo template (cached across reruns).
+            # Both are handed over as bytes, so no input is written to disk.
             if override_template is not None:
-                path_b = tmpdir / "template_B.xlsx"
-                path_b.write_bytes(override_template.getbuffer())
+                path_b_bytes = override_template.getvalue()
             else:
-                path_b = TEMPLATE_PATH
+                path_b_bytes = load_template_bytes(str(TEMPLATE_PATH), TEMPLATE_PATH.stat().st_mtime)
 
             # Output name: Stick_List_Date (today in America/New_York)
             today_str = datetime.now(NY_TZ).date().strftime("%Y-%m-%d")
@@ -82,13 +97,16 @@ if run:
             diff_csv = tmpdir / "diff_report.csv" if make_diff else None
 
             transform_files(
-                path_a=str(path_a),
-                path_b=str(path_b),
+                path_a=None,  # inventory already built from the upload
+                path_b=None,  # template handed over as bytes
                 out_path=str(out_xlsx),
                 defect_exclusion=defect_exclusion,
                 filldown_b_template=filldown_b_template,
                 diff_csv=(str(diff_csv) if diff_csv else None),
+                path_b_bytes=path_b_bytes,
+                inv=inv,
             )
+            del path_b_bytes, inv  # free inputs before the outputs are read back
 
             st.success("Done!")
 
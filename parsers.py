@@ -0,0 +1,145 @@
+"""
+Cell parsing helpers shared by Spreadsheet A ingestion and the B template pass.
+
+These run once per data cell, so they are kept fully annotated and free of
+dynamic tricks: the module can be compiled with mypyc (`mypyc parsers.py`) for
+a C-extension speedup, and the same source is imported as plain Python when no
+extension has been built.
+"""
+
+import math
+import re
+import sys
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def has_non_ascii(s: str) -> bool:
+    return not s.isascii()
+
+def norm_text(v: Any) -> Optional[str]:
+    if v is None:
+        return None
+    s = str(v).strip()
+    return s if s else None
+
+# Model/Style/Blade strings make up the inventory keys and repeat across thousands
+# of rows; interning them means key hashing/equality mostly hits identical objects.
+
+def norm_model(v: Any) -> Optional[str]:
+    s = norm_text(v)
+    return sys.intern(s) if s else None
+
+def norm_blade(v: Any) -> Optional[str]:
+    s = norm_text(v)
+    return sys.intern(s.upper()) if s else None
+
+def norm_style(v: Any) -> Optional[str]:
+    s = norm_text(v)
+    return sys.intern(s.upper()) if s else None
+
+def split_model_and_style(model_raw: Any) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract trailing parentheses content, supporting both ASCII () and full-width （）.
+
+    Examples:
+      "FT8 Pro (RED)" -> ("FT8 Pro", "RED")
+      "FT6（red,black.blue,green）" -> ("FT6", "red,black.blue,green")
+      "Flylite USA Flag     （Tracer axis）" -> ("Flylite USA Flag", "Tracer axis")
+    """
+    s = norm_model(model_raw)
+    if not s:
+        return None, None
+    return split_model_text(s)
+
+def split_model_text(s: str) -> Tuple[str, Optional[str]]:
+    """split_model_and_style() for a model string that is already normalised (non-empty, stripped)."""
+    # Normalize full-width parentheses to ASCII and trim
+    s_norm = s.replace("（", "(").replace("）", ")").strip()
+
+    # Only a trailing "(...)" group with no parentheses inside counts as the style.
+    # Plain str scans; the "\n" check keeps the old `(.*?)` regex's refusal of
+    # multi-line bases.
+    if s_norm.endswith(")"):
+        i = s_norm.rfind("(")
+        if i >= 0 and ")" not in s_norm[i + 1:-1]:
+            base = s_norm[:i].rstrip()
+            if "\n" not in base:
+                style = s_norm[i + 1:-1].strip() or None
+                return sys.intern(base or s_norm), style
+    return sys.intern(s_norm), None
+
+def _flex_str(v: str) -> Optional[int]:
+    if v.isdecimal():
+        return int(v)
+    m = _DIGITS_RE.search(v)
+    return int(m.group(0)) if m else None
+
+def parse_flex(v: Any) -> Optional[int]:
+    # Exact-type checks in order of frequency; subclasses (e.g. bool) fall through
+    if v is None:
+        return None
+    if type(v) is int:
+        return v
+    if type(v) is float:
+        return int(round(v))
+    if type(v) is str:
+        return _flex_str(v)
+    if isinstance(v, int):
+        return int(v)
+    if isinstance(v, float):
+        return int(round(v))
+    if isinstance(v, str):
+        return _flex_str(v)
+    return None
+
+def _qty_none(v: Any, defect_exclusion: bool) -> Optional[int]:
+    return None
+
+def _qty_int(v: int, defect_exclusion: bool) -> Optional[int]:
+    return v  # dispatched on exact int only
+
+def _qty_float(v: float, defect_exclusion: bool) -> Optional[int]:
+    if math.isfinite(v) and abs(v - round(v)) < 1e-9:
+        return int(round(v))
+    return int(v)
+
+def _qty_str(v: str, defect_exclusion: bool) -> Optional[int]:
+    s = v.strip()
+    if not s:
+        return None
+    if defect_exclusion and not s.isascii():
+        return None
+    if s.isdecimal():
+        return int(s)
+    m = _DIGITS_RE.search(s)
+    return int(m.group(0)) if m else None
+
+def _qty_other(v: Any, defect_exclusion: bool) -> Optional[int]:
+    # Subclasses (e.g. bool) and anything else openpyxl may hand back
+    if isinstance(v, int):
+        return int(v)
+    if isinstance(v, float):
+        return _qty_float(v, defect_exclusion)
+    if isinstance(v, str):
+        return _qty_str(v, defect_exclusion)
+    return None
+
+# Exact-type dispatch: one dict lookup instead of an isinstance chain per cell
+_QTY_DISPATCH: Dict[type, Callable[[Any, bool], Optional[int]]] = {
+    type(None): _qty_none,
+    int: _qty_int,
+    float: _qty_float,
+    str: _qty_str,
+}
+
+def parse_qty(v: Any, defect_exclusion: bool = True) -> Optional[int]:
+    """
+    Quantity parsing:
+    - numeric -> int
+    - string with digits -> int(digits)
+    - if defect_exclusion and string contains non-ascii -> excluded (None)
+    """
+    return _QTY_DISPATCH.get(type(v), _qty_other)(v, defect_exclusion)
@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import transform  # noqa: E402
+
+TEMPLATE = ROOT / "templates" / "Renee(B).xlsx"
+
+
+def test_golden_copy_in_place(tmp_path):
+    # A first run leaves a template that already has its Style/Color column and
+    # filled values, so re-applying the same inventory changes no cell
+    out = tmp_path / "out.xlsx"
+    transform.apply_to_b_template(str(TEMPLATE), str(out), {})
+    before = out.read_bytes()
+
+    original, written = transform.apply_to_b_template(str(out), str(out), {})
+
+    assert out.read_bytes() == before
+    assert written == original
@@ -0,0 +1,56 @@
+import io
+import re
+import sys
+import zipfile
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import transform  # noqa: E402
+
+TEMPLATE = ROOT / "templates" / "Renee(B).xlsx"
+
+
+def stale_dimension_copy(path: Path) -> bytes:
+    """Copy of an xlsx whose worksheets claim <dimension ref="A1"/>."""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(path) as zin, zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zout:
+        for name in zin.namelist():
+            data = zin.read(name)
+            if name.startswith("xl/worksheets/sheet"):
+                data = re.sub(rb"<dimension ref=\"[^\"]*\"/>", b"<dimension ref=\"A1\"/>", data)
+            zout.writestr(name, data)
+    return buf.getvalue()
+
+
+def test_template_index_ignores_stale_dimension():
+    good = transform.build_template_index(str(TEMPLATE))
+    stale = transform.build_template_index(stale_dimension_copy(TEMPLATE))
+    assert len(good.keys) > 1
+    assert stale.keys == good.keys
+    assert stale.original == good.original
+
+
+def test_outputs_ignore_stale_dimension(tmp_path):
+    stale = stale_dimension_copy(TEMPLATE)
+    stale_path = tmp_path / "stale.xlsx"
+    stale_path.write_bytes(stale)
+    inv = {}
+
+    for fast_mode in (False, True):
+        expected = tmp_path / f"good_{fast_mode}.xlsx"
+        actual = tmp_path / f"stale_{fast_mode}.xlsx"
+        transform.apply_to_b_template(str(TEMPLATE), str(expected), inv, fast_mode=fast_mode)
+        transform.apply_to_b_template(stale, str(actual), inv, fast_mode=fast_mode)
+
+        rows_expected = list(load_workbook(expected).active.iter_rows(min_col=2, max_col=7, values_only=True))
+        rows_actual = list(load_workbook(actual).active.iter_rows(min_col=2, max_col=7, values_only=True))
+        assert rows_actual == rows_expected
+
+    # The stand-alone diff must see every row of the stale template too
+    transform.write_diff_csv(str(stale_path), str(tmp_path / "good_False.xlsx"), str(tmp_path / "a.csv"))
+    transform.write_diff_csv(str(TEMPLATE), str(tmp_path / "good_False.xlsx"), str(tmp_path / "b.csv"))
+    assert (tmp_path / "a.csv").read_text(encoding="utf-8") == (tmp_path / "b.csv").read_text(encoding="utf-8")